@@ -1,47 +1,20 @@
+import functools
 import json
+import os
 import re
 import sys
-import xml.etree.ElementTree as ET
 
-def get_stat_value(stats, key, default=0):
-    """
-    Safely retrieves a numeric value from the stats dictionary.
-    """
-    try:
-        return float(stats.get(key, default))
-    except (ValueError, TypeError):
-        return default
-
-def parse_stats(stats_file):
-    """
-    Parses the stats.txt file and returns a dictionary of key-value pairs.
-    """
-    stats = {}
-    with open(stats_file, 'r') as f:
-        for line in f:
-            if not line.strip() or '---' in line or line.startswith('End'):
-                continue
-            
-            parts = line.split()
-            if len(parts) >= 2:
-                key = parts[0]
-                value = parts[1]
-                stats[key] = value
-    return stats
+# orjson decodes large gem5 config.json files several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def parse_config(config_file):
-    """
-    Parses the config.json file and returns a dictionary of configuration data.
-    """
-    with open(config_file, 'r') as f:
-        config_data = json.load(f)
-    return config_data
+# Blank, separator and "End" lines of stats.txt carry no stats
+_SKIP_LINE = re.compile(rb'^\s*(?:$|-{3}|End)').match
 
-def create_mcpat_xml(stats, config):
-    """
-    Creates an McPAT XML file based on the gem5 stats and config.
-    """
-    mcpat_template = """<?xml version="1.0"?>
+# McPAT input skeleton; {name} holes are filled by create_mcpat_xml
+MCPAT_TEMPLATE = """<?xml version="1.0"?>
 <component id="root" name="root" >
     <component id="system" name="system">
         <param name="number_of_cores" value="1"/>
@@ -50,20 +23,20 @@ def create_mcpat_xml(stats, config):
         <param name="number_of_L2_caches" value="1"/>
         <param name="number_of_L3_caches" value="0"/>
         <param name="number_of_NoC" value="0"/>
-        <param name="target_core_clockrate" value="0"/>
-        <param name="total_cycles" value="0"/>
+        <param name="target_core_clockrate" value="{target_core_clockrate}"/>
+        <param name="total_cycles" value="{total_cycles}"/>
         <param name="peak_power_per_chip" value="0"/>
-        <param name="total_insts" value="0"/>
+        <param name="total_insts" value="{total_insts}"/>
         <component id="core0" name="core">
-            <param name="clock_rate" value="0"/>
-            <param name="total_inst" value="0"/>
-            <param name="int_inst" value="0"/>
-            <param name="fp_inst" value="0"/>
-            <param name="load_inst" value="0"/>
-            <param name="store_inst" value="0"/>
-            <param name="committed_inst" value="0"/>
-            <param name="committed_int_inst" value="0"/>
-            <param name="committed_fp_inst" value="0"/>
+            <param name="clock_rate" value="{clock_rate}"/>
+            <param name="total_inst" value="{total_inst}"/>
+            <param name="int_inst" value="{int_inst}"/>
+            <param name="fp_inst" value="{fp_inst}"/>
+            <param name="load_inst" value="{load_inst}"/>
+            <param name="store_inst" value="{store_inst}"/>
+            <param name="committed_inst" value="{committed_inst}"/>
+            <param name="committed_int_inst" value="{committed_int_inst}"/>
+            <param name="committed_fp_inst" value="{committed_fp_inst}"/>
             <param name="rob_accesses" value="0"/>
             <param name="issue_queue_accesses" value="0"/>
             <param name="int_regfile_reads" value="0"/>
@@ -73,56 +46,56 @@ def create_mcpat_xml(stats, config):
             <param name="rename_accesses" value="0"/>
             <param name="rob_reads" value="0"/>
             <param name="rob_writes" value="0"/>
-            <param name="L1I_hits" value="0"/>
-            <param name="L1I_misses" value="0"/>
-            <param name="L1D_hits" value="0"/>
-            <param name="L1D_misses" value="0"/>
-            <param name="L2_hits" value="0"/>
-            <param name="L2_misses" value="0"/>
+            <param name="L1I_hits" value="{L1I_hits}"/>
+            <param name="L1I_misses" value="{L1I_misses}"/>
+            <param name="L1D_hits" value="{L1D_hits}"/>
+            <param name="L1D_misses" value="{L1D_misses}"/>
+            <param name="L2_hits" value="{L2_hits}"/>
+            <param name="L2_misses" value="{L2_misses}"/>
             <param name="Instruction_Fetch_Buffer_reads" value="0"/>
             <param name="Instruction_Fetch_Buffer_writes" value="0"/>
-            <param name="ITLB_accesses" value="0"/>
-            <param name="ITLB_misses" value="0"/>
-            <param name="DTLB_accesses" value="0"/>
-            <param name="DTLB_misses" value="0"/>
-            <param name="branch_insts" value="0"/>
-            <param name="branch_mispredictions" value="0"/>
+            <param name="ITLB_accesses" value="{ITLB_accesses}"/>
+            <param name="ITLB_misses" value="{ITLB_misses}"/>
+            <param name="DTLB_accesses" value="{DTLB_accesses}"/>
+            <param name="DTLB_misses" value="{DTLB_misses}"/>
+            <param name="branch_insts" value="{branch_insts}"/>
+            <param name="branch_mispredictions" value="{branch_mispredictions}"/>
         </component>
         <component id="L1_I_cache" name="L1Icache">
-            <param name="cache_size" value="0"/>
-            <param name="line_size" value="0"/>
-            <param name="associativity" value="0"/>
+            <param name="cache_size" value="{l1i_cache_size}"/>
+            <param name="line_size" value="{l1i_line_size}"/>
+            <param name="associativity" value="{l1i_associativity}"/>
             <param name="bank" value="1"/>
             <param name="sequential_access" value="true"/>
             <param name="read_accesses" value="0"/>
             <param name="write_accesses" value="0"/>
-            <param name="total_accesses" value="0"/>
-            <param name="total_reads" value="0"/>
-            <param name="total_writes" value="0"/>
+            <param name="total_accesses" value="{l1i_total_accesses}"/>
+            <param name="total_reads" value="{l1i_total_reads}"/>
+            <param name="total_writes" value="{l1i_total_writes}"/>
         </component>
         <component id="L1_D_cache" name="L1Dcache">
-            <param name="cache_size" value="0"/>
-            <param name="line_size" value="0"/>
-            <param name="associativity" value="0"/>
+            <param name="cache_size" value="{l1d_cache_size}"/>
+            <param name="line_size" value="{l1d_line_size}"/>
+            <param name="associativity" value="{l1d_associativity}"/>
             <param name="bank" value="1"/>
             <param name="sequential_access" value="true"/>
             <param name="read_accesses" value="0"/>
             <param name="write_accesses" value="0"/>
-            <param name="total_accesses" value="0"/>
-            <param name="total_reads" value="0"/>
-            <param name="total_writes" value="0"/>
+            <param name="total_accesses" value="{l1d_total_accesses}"/>
+            <param name="total_reads" value="{l1d_total_reads}"/>
+            <param name="total_writes" value="{l1d_total_writes}"/>
         </component>
         <component id="L2_cache" name="L2cache">
-            <param name="cache_size" value="0"/>
-            <param name="line_size" value="0"/>
-            <param name="associativity" value="0"/>
+            <param name="cache_size" value="{l2_cache_size}"/>
+            <param name="line_size" value="{l2_line_size}"/>
+            <param name="associativity" value="{l2_associativity}"/>
             <param name="bank" value="1"/>
             <param name="sequential_access" value="true"/>
             <param name="read_accesses" value="0"/>
             <param name="write_accesses" value="0"/>
-            <param name="total_accesses" value="0"/>
-            <param name="total_reads" value="0"/>
-            <param name="total_writes" value="0"/>
+            <param name="total_accesses" value="{l2_total_accesses}"/>
+            <param name="total_reads" value="{l2_total_reads}"/>
+            <param name="total_writes" value="{l2_total_writes}"/>
         </component>
         <component id="L1_directory" name="L1Directory">
             <param name="number_of_L1Directories" value="0"/>
@@ -131,160 +104,230 @@ def create_mcpat_xml(stats, config):
         </component>
         <component id="main_memory" name="main_memory">
             <param name="peak_memory_bw" value="25.6"/>
-            <param name="ext_dram_accesses" value="0"/>
+            <param name="ext_dram_accesses" value="{ext_dram_accesses}"/>
         </component>
     </component>
 </component>
 """
 
+def _intern_rows(rows):
+    """
+    Interns the stats key of each (template hole, stats key, default) row.
+    parse_stats interns its keys too, so dict lookups match on identity.
+    """
+    return tuple((name, sys.intern(key), default) for name, key, default in rows)
+
+# (template hole, stats.txt key, default) rows; every value is a counter.
+# Pipeline access counts (ROB, issue queue, register files, rename) have no
+# gem5 stat, so the template hard-codes them to 0 instead of looking them up.
+SYSTEM_MAPPING = _intern_rows((
+    ('total_insts', 'simInsts', 0),
+    ('total_cycles', 'board.processor.cores.core.tickCycles', 0),
+))
+
+CORE_MAPPING = _intern_rows((
+    # Use simInsts for total and committed instructions
+    ('total_inst', 'simInsts', 0),
+    ('committed_inst', 'simInsts', 0),
+    # Get load and store instruction counts from the data cache stats
+    ('load_inst', 'board.cache_hierarchy.l1dcaches.ReadReq.accesses::total', 0),
+    ('store_inst', 'board.cache_hierarchy.l1dcaches.WriteReq.accesses::total', 0),
+    ('int_inst', 'board.processor.cores.core.int_insts', 0),
+    ('fp_inst', 'board.processor.cores.core.fp_insts', 0),
+    ('committed_int_inst', 'board.processor.cores.core.committed_int_insts', 0),
+    ('committed_fp_inst', 'board.processor.cores.core.committed_fp_insts', 0),
+    # Cache and TLB accesses
+    ('L1I_hits', 'board.cache_hierarchy.l1icaches.overallHits::total', 0),
+    ('L1I_misses', 'board.cache_hierarchy.l1icaches.overallMisses::total', 0),
+    ('L1D_hits', 'board.cache_hierarchy.l1dcaches.overallHits::total', 0),
+    ('L1D_misses', 'board.cache_hierarchy.l1dcaches.overallMisses::total', 0),
+    ('L2_hits', 'board.cache_hierarchy.l2cache.overallHits::total', 0),
+    ('L2_misses', 'board.cache_hierarchy.l2cache.overallMisses::total', 0),
+    # TLB stats
+    ('ITLB_accesses', 'board.processor.cores.core.mmu.dtb.accesses', 0),
+    ('ITLB_misses', 'board.processor.cores.core.mmu.dtb.misses', 0),
+    ('DTLB_accesses', 'board.processor.cores.core.mmu.itb.accesses', 0),
+    ('DTLB_misses', 'board.processor.cores.core.mmu.itb.misses', 0),
+    # Branch Prediction
+    ('branch_insts', 'board.processor.cores.core.branchPred.condPredicted', 0),
+    ('branch_mispredictions', 'board.processor.cores.core.branchPred.condIncorrect', 0),
+))
+
+L1I_MAPPING = _intern_rows((
+    ('l1i_total_accesses', 'board.cache_hierarchy.l1icaches.overallAccesses::total', 0),
+    ('l1i_total_reads', 'board.cache_hierarchy.l1icaches.ReadReq.accesses::total', 0),
+    ('l1i_total_writes', 'board.cache_hierarchy.l1icaches.WriteReq.accesses::total', 0),
+))
+
+L1D_MAPPING = _intern_rows((
+    ('l1d_total_accesses', 'board.cache_hierarchy.l1dcaches.overallAccesses::total', 0),
+    ('l1d_total_reads', 'board.cache_hierarchy.l1dcaches.ReadReq.accesses::total', 0),
+    ('l1d_total_writes', 'board.cache_hierarchy.l1dcaches.WriteReq.accesses::total', 0),
+))
+
+L2_MAPPING = _intern_rows((
+    ('l2_total_accesses', 'board.cache_hierarchy.l2cache.overallAccesses::total', 0),
+    ('l2_total_reads', 'board.cache_hierarchy.l2cache.ReadReq.accesses::total', 0),
+    ('l2_total_writes', 'board.cache_hierarchy.l2cache.WriteReq.accesses::total', 0),
+))
+
+# Main memory accesses are the sum of these counters
+EXT_DRAM_KEYS = tuple(sys.intern(key) for key in (
+    'board.memory.mem_ctrl.dram.numReads::total',
+    'board.cache_hierarchy.l1dcaches.writebacks::total',
+))
+
+def get_stat_value(stats, key, default=0):
+    """
+    Safely retrieves a numeric value from the stats dictionary.
+    Values are already numbers, converted once by parse_stats.
+    """
+    return stats.get(key, default)
+
+def get_stat_int(stats, key, default=0):
+    """
+    Retrieves a counter from the stats dictionary as an int.
+    """
+    return int(stats.get(key, default))
+
+def parse_stats(stats_file):
+    """
+    Parses the stats.txt file and returns a dictionary of key-value pairs.
+    Integer counters are stored as int and other numbers as float;
+    non-numeric values are skipped.
+    """
+    stats = {}
+    # Bytes mode: only the key of each kept line gets decoded
+    with open(stats_file, 'rb') as f:
+        data = f.read()
+
+    for line in data.splitlines():
+        if _SKIP_LINE(line):
+            continue
+
+        # Only the key and the first value token are needed; any
+        # whitespace separates them, and the description is left unsplit
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            continue
+        value = parts[1]
+        try:
+            stats[sys.intern(parts[0].decode())] = int(value) if value.isdigit() else float(value)
+        except ValueError:
+            # Distribution bins and other non-numeric values
+            pass
+    return stats
+
+def parse_config(config_file):
+    """
+    Parses the config.json file and returns a dictionary of configuration data.
+    """
+    with open(config_file, 'rb') as f:
+        data = f.read()
+
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # gem5 writes inf/nan params as Infinity/NaN, which only
+            # the stdlib parser accepts
+            pass
+    return json.loads(data)
+
+def create_mcpat_xml(stats, config):
+    """
+    Creates an McPAT XML file based on the gem5 stats and config.
+    The document is returned as UTF-8 bytes, ready to be written out.
+    """
+    # Every hole in the template is filled from this dict
+    vals = {}
 
-    tree = ET.ElementTree(ET.fromstring(mcpat_template))
-    root = tree.getroot()
+    # Clock rate in MHz, shared by the system and the core
+    clock_rate_hz = get_stat_value(stats, 'simFreq', 1000000000000)
+    clock_rate_mhz = str(clock_rate_hz / 1000000.0)
 
-    # Get cache line size from the system configuration
-    cache_line_size = config.get('board', {}).get('cache_line_size', 64)
+    # Get cache line size and cache configs from the system configuration
+    board = config.get('board', {})
+    cache_line_size = board.get('cache_line_size', 64)
+    cache_hierarchy = board.get('cache_hierarchy', {})
 
     # System parameters
-    system_node = root.find(".//component[@name='system']")
-    if system_node:
-        total_insts = get_stat_value(stats, 'simInsts')
-        system_node.find(".//param[@name='total_insts']").attrib['value'] = str(int(total_insts))
-        total_cycles = get_stat_value(stats, 'board.processor.cores.core.tickCycles')
-        system_node.find(".//param[@name='total_cycles']").attrib['value'] = str(int(total_cycles))
-        
-        # Clock rate in MHz
-        clock_rate_hz = get_stat_value(stats, 'simFreq', 1000000000000)
-        clock_rate_mhz = clock_rate_hz / 1000000.0
-        system_node.find(".//param[@name='target_core_clockrate']").attrib['value'] = str(clock_rate_mhz)
+    vals['target_core_clockrate'] = clock_rate_mhz
+    for name, key, default in SYSTEM_MAPPING:
+        vals[name] = get_stat_int(stats, key, default)
 
     # Core parameters
-    core_node = root.find(".//component[@name='core']")
-    if core_node:
-        core_node.find(".//param[@name='clock_rate']").attrib['value'] = str(clock_rate_mhz)
-        # Use simInsts for total and committed instructions
-        total_inst = get_stat_value(stats, 'simInsts')
-        core_node.find(".//param[@name='total_inst']").attrib['value'] = str(int(total_inst))
-        core_node.find(".//param[@name='committed_inst']").attrib['value'] = str(int(total_inst))
-        
-        # Get load and store instruction counts from the data cache stats
-        load_inst = get_stat_value(stats, 'board.cache_hierarchy.l1dcaches.ReadReq.accesses::total')
-        store_inst = get_stat_value(stats, 'board.cache_hierarchy.l1dcaches.WriteReq.accesses::total')
-        
-        core_node.find(".//param[@name='int_inst']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.int_insts', 0)))
-        core_node.find(".//param[@name='fp_inst']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.fp_insts', 0)))
-        core_node.find(".//param[@name='load_inst']").attrib['value'] = str(int(load_inst))
-        core_node.find(".//param[@name='store_inst']").attrib['value'] = str(int(store_inst))
-        core_node.find(".//param[@name='committed_int_inst']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.committed_int_insts', 0)))
-        core_node.find(".//param[@name='committed_fp_inst']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.committed_fp_insts', 0)))
-
-        # Pipeline access counts (not in stats.txt, so they will be 0)
-        core_node.find(".//param[@name='rob_accesses']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.rob_accesses', 0)))
-        core_node.find(".//param[@name='issue_queue_accesses']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.issue_queue_accesses', 0)))
-        core_node.find(".//param[@name='int_regfile_reads']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.int_regfile_reads', 0)))
-        core_node.find(".//param[@name='fp_regfile_reads']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.fp_regfile_reads', 0)))
-        core_node.find(".//param[@name='int_regfile_writes']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.int_regfile_writes', 0)))
-        core_node.find(".//param[@name='fp_regfile_writes']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.fp_regfile_writes', 0)))
-        core_node.find(".//param[@name='rename_accesses']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.rename_accesses', 0)))
-        
-        core_node.find(".//param[@name='rob_reads']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.rob_reads', 0)))
-        core_node.find(".//param[@name='rob_writes']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.rob_writes', 0)))
-
-        # Cache and TLB accesses
-        core_node.find(".//param[@name='L1I_hits']").attrib['value'] = str(int(get_stat_value(stats, 'board.cache_hierarchy.l1icaches.overallHits::total', 0)))
-        core_node.find(".//param[@name='L1I_misses']").attrib['value'] = str(int(get_stat_value(stats, 'board.cache_hierarchy.l1icaches.overallMisses::total', 0)))
-        core_node.find(".//param[@name='L1D_hits']").attrib['value'] = str(int(get_stat_value(stats, 'board.cache_hierarchy.l1dcaches.overallHits::total')))
-        core_node.find(".//param[@name='L1D_misses']").attrib['value'] = str(int(get_stat_value(stats, 'board.cache_hierarchy.l1dcaches.overallMisses::total')))
-        core_node.find(".//param[@name='L2_hits']").attrib['value'] = str(int(get_stat_value(stats, 'board.cache_hierarchy.l2cache.overallHits::total', 0)))
-        core_node.find(".//param[@name='L2_misses']").attrib['value'] = str(int(get_stat_value(stats, 'board.cache_hierarchy.l2cache.overallMisses::total', 0)))
-        
-        # TLB stats (not in stats.txt, so they will be 0)
-        core_node.find(".//param[@name='ITLB_accesses']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.mmu.dtb.accesses', 0)))
-        core_node.find(".//param[@name='ITLB_misses']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.mmu.dtb.misses', 0)))
-        core_node.find(".//param[@name='DTLB_accesses']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.mmu.itb.accesses', 0)))
-        core_node.find(".//param[@name='DTLB_misses']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.mmu.itb.misses', 0)))
-
-        # Branch Prediction
-        core_node.find(".//param[@name='branch_insts']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.branchPred.condPredicted', 0)))
-        core_node.find(".//param[@name='branch_mispredictions']").attrib['value'] = str(int(get_stat_value(stats, 'board.processor.cores.core.branchPred.condIncorrect', 0)))
-    
+    vals['clock_rate'] = clock_rate_mhz
+    for name, key, default in CORE_MAPPING:
+        vals[name] = get_stat_int(stats, key, default)
+
+    # Cache parameters stay 0 unless their config entry is found below
+    for cache in ('l1i', 'l1d', 'l2'):
+        for field in ('cache_size', 'line_size', 'associativity', 'total_accesses', 'total_reads', 'total_writes'):
+            vals[f'{cache}_{field}'] = 0
+
     # L1I Cache parameters
-    l1i_node = root.find(".//component[@name='L1Icache']")
-    if l1i_node:
-        try:
-            l1i_config_list = config['board']['cache_hierarchy']['l1icaches']
-            l1i_config = l1i_config_list[0]
-            size = l1i_config['size']
-            assoc = l1i_config['assoc']
-            
-            l1i_node.find(".//param[@name='cache_size']").attrib['value'] = str(int(size) / 1024)
-            l1i_node.find(".//param[@name='line_size']").attrib['value'] = str(cache_line_size)
-            l1i_node.find(".//param[@name='associativity']").attrib['value'] = str(assoc)
-            
-            l1i_accesses = get_stat_value(stats, 'board.cache_hierarchy.l1icaches.overallAccesses::total', 0)
-            l1i_reads = get_stat_value(stats, 'board.cache_hierarchy.l1icaches.ReadReq.accesses::total', 0)
-            l1i_writes = get_stat_value(stats, 'board.cache_hierarchy.l1icaches.WriteReq.accesses::total', 0)
-            
-            l1i_node.find(".//param[@name='total_accesses']").attrib['value'] = str(int(l1i_accesses))
-            l1i_node.find(".//param[@name='total_reads']").attrib['value'] = str(int(l1i_reads))
-            l1i_node.find(".//param[@name='total_writes']").attrib['value'] = str(int(l1i_writes))
-        except (KeyError, IndexError):
-            print("Warning: Could not find L1I cache config. Defaulting to 0.")
-    
+    try:
+        l1i_config = cache_hierarchy['l1icaches'][0]
+        size = l1i_config['size']
+        assoc = l1i_config['assoc']
+
+        vals['l1i_cache_size'] = int(size) / 1024
+        vals['l1i_line_size'] = cache_line_size
+        vals['l1i_associativity'] = assoc
+
+        for name, key, default in L1I_MAPPING:
+            vals[name] = get_stat_int(stats, key, default)
+    except (KeyError, IndexError):
+        print("Warning: Could not find L1I cache config. Defaulting to 0.")
+
     # L1D Cache parameters
-    l1d_node = root.find(".//component[@name='L1Dcache']")
-    if l1d_node:
-        try:
-            l1d_config_list = config['board']['cache_hierarchy']['l1dcaches']
-            l1d_config = l1d_config_list[0]
-            size = l1d_config['size']
-            assoc = l1d_config['assoc']
-            
-            l1d_node.find(".//param[@name='cache_size']").attrib['value'] = str(int(size) / 1024)
-            l1d_node.find(".//param[@name='line_size']").attrib['value'] = str(cache_line_size)
-            l1d_node.find(".//param[@name='associativity']").attrib['value'] = str(assoc)
-            
-            l1d_accesses = get_stat_value(stats, 'board.cache_hierarchy.l1dcaches.overallAccesses::total')
-            l1d_reads = get_stat_value(stats, 'board.cache_hierarchy.l1dcaches.ReadReq.accesses::total')
-            l1d_writes = get_stat_value(stats, 'board.cache_hierarchy.l1dcaches.WriteReq.accesses::total')
-            
-            l1d_node.find(".//param[@name='total_accesses']").attrib['value'] = str(int(l1d_accesses))
-            l1d_node.find(".//param[@name='total_reads']").attrib['value'] = str(int(l1d_reads))
-            l1d_node.find(".//param[@name='total_writes']").attrib['value'] = str(int(l1d_writes))
-        except (KeyError, IndexError):
-            print("Warning: Could not find L1D cache config. Defaulting to 0.")
-    
+    try:
+        l1d_config = cache_hierarchy['l1dcaches'][0]
+        size = l1d_config['size']
+        assoc = l1d_config['assoc']
+
+        vals['l1d_cache_size'] = int(size) / 1024
+        vals['l1d_line_size'] = cache_line_size
+        vals['l1d_associativity'] = assoc
+
+        for name, key, default in L1D_MAPPING:
+            vals[name] = get_stat_int(stats, key, default)
+    except (KeyError, IndexError):
+        print("Warning: Could not find L1D cache config. Defaulting to 0.")
+
     # L2 Cache parameters
-    l2_node = root.find(".//component[@name='L2cache']")
-    if l2_node:
-        try:
-            l2_config = config['board']['cache_hierarchy']['l2cache']
-            
-            size = l2_config['size']
-            assoc = l2_config['assoc']
-            
-            l2_node.find(".//param[@name='cache_size']").attrib['value'] = str(int(size) / 1024)
-            l2_node.find(".//param[@name='line_size']").attrib['value'] = str(cache_line_size)
-            l2_node.find(".//param[@name='associativity']").attrib['value'] = str(assoc)
-            
-            l2_accesses = get_stat_value(stats, 'board.cache_hierarchy.l2cache.overallAccesses::total', 0)
-            l2_reads = get_stat_value(stats, 'board.cache_hierarchy.l2cache.ReadReq.accesses::total', 0)
-            l2_writes = get_stat_value(stats, 'board.cache_hierarchy.l2cache.WriteReq.accesses::total', 0)
-            
-            l2_node.find(".//param[@name='total_accesses']").attrib['value'] = str(int(l2_accesses))
-            l2_node.find(".//param[@name='total_reads']").attrib['value'] = str(int(l2_reads))
-            l2_node.find(".//param[@name='total_writes']").attrib['value'] = str(int(l2_writes))
-        except KeyError:
-            print("Warning: Could not find L2 cache config. Defaulting to 0.")
-    
+    try:
+        l2_config = cache_hierarchy['l2cache']
+        size = l2_config['size']
+        assoc = l2_config['assoc']
+
+        vals['l2_cache_size'] = int(size) / 1024
+        vals['l2_line_size'] = cache_line_size
+        vals['l2_associativity'] = assoc
+
+        for name, key, default in L2_MAPPING:
+            vals[name] = get_stat_int(stats, key, default)
+    except KeyError:
+        print("Warning: Could not find L2 cache config. Defaulting to 0.")
+
     # Main Memory
-    mem_node = root.find(".//component[@name='main_memory']")
-    if mem_node:
-        dram_reads = get_stat_value(stats, 'board.memory.mem_ctrl.dram.numReads::total', 0)
-        l1d_writebacks = get_stat_value(stats, 'board.cache_hierarchy.l1dcaches.writebacks::total', 0)
-        ext_dram_accesses = dram_reads + l1d_writebacks
-        mem_node.find(".//param[@name='ext_dram_accesses']").attrib['value'] = str(int(ext_dram_accesses))
+    vals['ext_dram_accesses'] = sum(get_stat_int(stats, key, 0) for key in EXT_DRAM_KEYS)
+
+    return MCPAT_TEMPLATE.format_map(vals).encode()
+
+@functools.lru_cache(maxsize=128)
+def _convert_cached(stats_file, stats_mtime, config_file, config_mtime):
+    # The mtimes are only part of the cache key
+    return create_mcpat_xml(parse_stats(stats_file), parse_config(config_file))
 
-    return ET.tostring(root, encoding='utf-8').decode('utf-8')
+def convert_files(stats_file, config_file):
+    """
+    Converts a stats.txt/config.json pair into McPAT XML.
+    Results are cached until either file's modification time changes.
+    """
+    return _convert_cached(stats_file, os.stat(stats_file).st_mtime_ns,
+                           config_file, os.stat(config_file).st_mtime_ns)
 
 if __name__ == "__main__":
     if len(sys.argv) != 3:
@@ -295,11 +338,9 @@ if __name__ == "__main__":
     config_file = sys.argv[2]
 
     try:
-        stats = parse_stats(stats_file)
-        config = parse_config(config_file)
-        mcpat_xml = create_mcpat_xml(stats, config)
+        mcpat_xml = convert_files(stats_file, config_file)
         
-        with open("mcpat_output.xml", "w") as f:
+        with open("mcpat_output.xml", "wb") as f:
             f.write(mcpat_xml)
         
         print("Successfully generated mcpat_output.xml")
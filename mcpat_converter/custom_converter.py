@@ -1,90 +1,142 @@
+import functools
 import json
+import logging
+import os
 import re
 import sys
-import xml.etree.ElementTree as ET
+import types
+
+_log = logging.getLogger(__name__)
+_log.addHandler(logging.NullHandler())
+
+# Optional faster JSON decoder for big config.json files
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Matches a "key value" stats.txt line; compiled once for the whole file
+_STAT_RE = re.compile(r'^\s*([a-zA-Z0-9_.:-]+)\s+([\d.]+e?[-+]?\d*)\s*')
 
 def parse_stats(stats_file):
     """
     Parses the stats.txt file into a dictionary for easy lookup.
+    The result is read-only and cached until the file changes on disk.
     """
+    st = os.stat(stats_file)
+    return _parse_stats_cached(stats_file, st.st_mtime_ns, st.st_size)
+
+@functools.lru_cache(maxsize=16)
+def _parse_stats_cached(stats_file, mtime_ns, size):
+    # mtime_ns and size only key the cache
     stats = {}
-    with open(stats_file, 'r') as f:
+    # Bound once so the loop skips attribute lookups per line
+    match_stat = _STAT_RE.match
+    set_stat = stats.__setitem__
+    # A 1 MiB buffer cuts the number of read() calls on large stats files
+    with open(stats_file, 'r', buffering=1 << 20) as f:
         for line in f:
-            # Skip lines that are just headers or comments
-            if not line.strip() or '----------' in line:
+            # Skip header lines; blank lines fall out at the split below.
+            # Top-level stats like simFreq have no '.' in their key, so the
+            # key's shape is no use as a pre-filter.
+            if line[0] == '-':
                 continue
-            
-            # Use regex to find a key-value pair.
-            # This handles different formats and ensures correct parsing of numbers.
-            match = re.match(r'^\s*([a-zA-Z0-9_.:-]+)\s+([\d.]+e?[-+]?\d*)\s*', line)
-            if match:
-                key = match.group(1).strip()
-                value = match.group(2).strip()
-                try:
-                    stats[key] = float(value)
-                except ValueError:
-                    # In case the value is not a number, like '0x1000'
-                    pass
-    return stats
-
-def get_stat_value(stats, key, default=0):
+
+            # Most lines are plain "key value # description"
+            parts = line.split(None, 2)
+            if len(parts) < 2:
+                continue
+            value = parts[1]
+            if value[0] not in '0123456789.':
+                # Not a number, like 'nan' or a '|' distribution bar
+                continue
+            try:
+                # Counters stay int so writing them back needs no float round trip
+                set_stat(parts[0], int(value) if value.isdigit() else float(value))
+            except ValueError:
+                # Fall back to the regex for values with a numeric prefix
+                # only, like '12.5%'
+                match = match_stat(line)
+                if match:
+                    try:
+                        set_stat(match.group(1), float(match.group(2)))
+                    except ValueError:
+                        # In case the value is not a number, like '0x1000'
+                        pass
+    return types.MappingProxyType(stats)
+
+# Common variations of stat names in gem5, built once at import
+STATS_MAP = {
+    'total_cycles': ('system.cpu.numCycles', 'system.cpu_clk_domain.num_cycles'),
+    'committedInsts': ('system.cpu.committedInsts', 'sim_insts'),
+    'int_insts': ('system.cpu.committed_int_insts',),
+    'fp_insts': ('system.cpu.committed_fp_insts',),
+    'branches': ('system.cpu.branches',),
+    'branchMispredicts': ('system.cpu.branchMispredictions',),
+    'icache.ReadReq::total': ('system.l1icaches.ReadReq::total',),
+    'icache.ReadReq::miss': ('system.l1icaches.ReadReq::miss',),
+    'dcache.ReadReq::total': ('system.l1dcaches.ReadReq::total',),
+    'dcache.ReadReq::miss': ('system.l1dcaches.ReadReq::miss',),
+    'dcache.WriteReq::total': ('system.l1dcaches.WriteReq::total',),
+    'dcache.WriteReq::miss': ('system.l1dcaches.WriteReq::miss',),
+    'l2cache.ReadReq::total': ('system.l2cache.ReadReq::total',),
+    'l2cache.ReadReq::miss': ('system.l2cache.ReadReq::miss',),
+    'l2cache.WriteReq::total': ('system.l2cache.WriteReq::total',),
+    'l2cache.WriteReq::miss': ('system.l2cache.WriteReq::miss',)
+}
+
+def get_stat_value(stats, key, default=0, missing=None):
     """
     Safely retrieves a numeric value from the stats dictionary.
     Handles potential parsing errors and varying gem5 stat formats.
+    Keys that are not found are added to the missing set when one is
+    given, so the caller can report them once; otherwise each miss is
+    logged as it happens.
     """
-    # Define a map for common variations of stat names in gem5
-    stats_map = {
-        'total_cycles': ['system.cpu.numCycles', 'system.cpu_clk_domain.num_cycles'],
-        'committedInsts': ['system.cpu.committedInsts', 'sim_insts'],
-        'int_insts': ['system.cpu.committed_int_insts'],
-        'fp_insts': ['system.cpu.committed_fp_insts'],
-        'branches': ['system.cpu.branches'],
-        'branchMispredicts': ['system.cpu.branchMispredictions'],
-        'icache.ReadReq::total': ['system.l1icaches.ReadReq::total'],
-        'icache.ReadReq::miss': ['system.l1icaches.ReadReq::miss'],
-        'dcache.ReadReq::total': ['system.l1dcaches.ReadReq::total'],
-        'dcache.ReadReq::miss': ['system.l1dcaches.ReadReq::miss'],
-        'dcache.WriteReq::total': ['system.l1dcaches.WriteReq::total'],
-        'dcache.WriteReq::miss': ['system.l1dcaches.WriteReq::miss'],
-        'l2cache.ReadReq::total': ['system.l2cache.ReadReq::total'],
-        'l2cache.ReadReq::miss': ['system.l2cache.ReadReq::miss'],
-        'l2cache.WriteReq::total': ['system.l2cache.WriteReq::total'],
-        'l2cache.WriteReq::miss': ['system.l2cache.WriteReq::miss']
-    }
-
-    if key in stats:
-        return stats[key]
+    value = stats.get(key)
+    if value is not None:
+        return value
     
     # Check for alternate names if direct key is not found
-    for name_candidate in stats_map.get(key, []):
-        if name_candidate in stats:
-            return stats[name_candidate]
+    for name_candidate in STATS_MAP.get(key, ()):
+        value = stats.get(name_candidate)
+        if value is not None:
+            return value
 
-    print(f"Warning: Stat '{key}' not found. Returning default value '{default}'.")
-    return float(default)
+    if missing is not None:
+        missing.add(key)
+    else:
+        _log.warning("Stat %r not found. Returning default value %r.", key, default)
+    return default
 
 def parse_config(config_file):
-    with open(config_file, 'r') as f:
-        config_data = json.load(f)
+    with open(config_file, 'rb') as f:
+        raw = f.read()
+
+    config_data = None
+    if orjson is not None:
+        try:
+            config_data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # orjson is strict JSON; json.dump output may hold Infinity or NaN
+            _log.debug("orjson could not decode %s, using json", config_file)
+    if config_data is None:
+        config_data = json.loads(raw)
 
     if isinstance(config_data, list):
         if config_data:
-            return config_data[0]
+            config_data = config_data[0]
         else:
             raise ValueError("config.json is an empty list.")
-    else:
-        return config_data
 
-def create_mcpat_xml(stats_data, config):
-    if isinstance(config, list) and len(config) > 0:
-        config = config[0]
-    elif not isinstance(config, dict):
+    if not isinstance(config_data, dict):
         raise TypeError("config object must be a dictionary.")
+    return config_data
 
-    mcpat_template = """<?xml version="1.0" ?>
+MCPAT_TEMPLATE = """<?xml version="1.0" ?>
 <component id="root" name="root">
     <component id="system" name="system">
-        <param name="number_of_cores" value="1"/>
+        <param name="number_of_cores" value="{number_of_cores}"/>
         <param name="number_of_L1Directories" value="0"/>
         <param name="number_of_L2Directories" value="0"/>
         <param name="number_of_L2s" value="1"/>
@@ -98,7 +150,7 @@ def create_mcpat_xml(stats_data, config):
         <param name="homogeneous_L3s" value="0"/>
         <param name="homogeneous_ccs" value="0"/>
         <param name="core_tech_node" value="40"/>
-        <param name="target_core_clockrate" value="1000.0"/>
+        <param name="target_core_clockrate" value="{target_core_clockrate}"/>
         <param name="temperature" value="340"/>
         <param name="number_cache_levels" value="2"/>
         <param name="interconnect_projection_type" value="1"/>
@@ -110,11 +162,11 @@ def create_mcpat_xml(stats_data, config):
         <param name="virtual_address_width" value="32"/>
         <param name="physical_address_width" value="32"/>
         <param name="virtual_memory_page_size" value="4096"/>
-        <stat name="total_cycles" value="100000"/>
+        <stat name="total_cycles" value="{total_cycles}"/>
         <stat name="idle_cycles" value="0"/>
-        <stat name="busy_cycles" value="100000"/>
+        <stat name="busy_cycles" value="{total_cycles}"/>
         <component id="system.core0" name="core0">
-            <param name="clock_rate" value="1000.0"/>
+            <param name="clock_rate" value="{clock_rate}"/>
             <param name="opt_local" value="0"/>
             <param name="instruction_length" value="32"/>
             <param name="opcode_width" value="7"/>
@@ -153,20 +205,20 @@ def create_mcpat_xml(stats_data, config):
             <param name="load_buffer_size" value="0"/>
             <param name="memory_ports" value="1"/>
             <param name="RAS_size" value="4"/>                      
-            <stat name="total_instructions" value="400000"/>
-            <stat name="int_instructions" value="200000"/>
-            <stat name="fp_instructions" value="100000"/>
-            <stat name="branch_instructions" value="100000"/>
-            <stat name="branch_mispredictions" value="0"/>
-            <stat name="load_instructions" value="0"/>
-            <stat name="store_instructions" value="50000"/>
-            <stat name="committed_instructions" value="400000"/>
-            <stat name="committed_int_instructions" value="200000"/>
-            <stat name="committed_fp_instructions" value="100000"/>
+            <stat name="total_instructions" value="{committed_insts}"/>
+            <stat name="int_instructions" value="{committed_int}"/>
+            <stat name="fp_instructions" value="{committed_fp}"/>
+            <stat name="branch_instructions" value="{branches}"/>
+            <stat name="branch_mispredictions" value="{branch_mispredicts}"/>
+            <stat name="load_instructions" value="{dcache_reads}"/>
+            <stat name="store_instructions" value="{dcache_writes}"/>
+            <stat name="committed_instructions" value="{committed_insts}"/>
+            <stat name="committed_int_instructions" value="{committed_int}"/>
+            <stat name="committed_fp_instructions" value="{committed_fp}"/>
             <stat name="pipeline_duty_cycle" value="1"/>
-            <stat name="total_cycles" value="100000"/>
+            <stat name="total_cycles" value="{core_cycles}"/>
             <stat name="idle_cycles" value="0"/>
-            <stat name="busy_cycles" value="100000"/>
+            <stat name="busy_cycles" value="{core_cycles}"/>
             <stat name="ROB_reads" value="400000"/>
             <stat name="ROB_writes" value="400000"/>
             <stat name="rename_reads" value="800000"/>
@@ -218,7 +270,7 @@ def create_mcpat_xml(stats_data, config):
                 <stat name="conflicts" value="0"/>
             </component>
             <component id="system.core0.icache" name="icache">
-                <param name="icache_config" value="32768,64,8,1,10,10,64,0"/>
+                <param name="icache_config" value="{icache_config}"/>
                 <param name="buffer_sizes" value="4, 4, 4,0"/>
                 <stat name="read_accesses" value="200000"/>
                 <stat name="read_misses" value="0"/>
@@ -231,7 +283,7 @@ def create_mcpat_xml(stats_data, config):
                 <stat name="conflicts" value="0"/>  
             </component>
             <component id="system.core0.dcache" name="dcache">
-                <param name="dcache_config" value="32768,64,8,1,10,10,64,1"/>
+                <param name="dcache_config" value="{dcache_config}"/>
                 <param name="buffer_sizes" value="4, 4, 4, 4"/>
                 <stat name="read_accesses" value="800000"/>
                 <stat name="write_accesses" value="27276"/>
@@ -252,8 +304,8 @@ def create_mcpat_xml(stats_data, config):
                 <param name="clockrate" value="3400"/>
                 <param name="ports" value="1,1,1"/>
                 <param name="device_type" value="0"/>
-                <stat name="read_accesses" value="200000"/>
-                <stat name="write_accesses" value="27276"/>
+                <stat name="read_accesses" value="{l2_reads}"/>
+                <stat name="write_accesses" value="{l2_writes}"/>
                 <stat name="read_misses" value="1632"/>
                 <stat name="write_misses" value="183"/>
                 <stat name="conflicts" value="0"/>  
@@ -279,94 +331,92 @@ def create_mcpat_xml(stats_data, config):
     </component>
 </component>
 """
-    tree = ET.ElementTree(ET.fromstring(mcpat_template))
-    root = tree.getroot()
+
+# Values of the core0 holes when there are no cores to take them from
+_CORE_DEFAULTS = {
+    'clock_rate': 1000.0,
+    'committed_insts': 400000,
+    'committed_int': 200000,
+    'committed_fp': 100000,
+    'branches': 100000,
+    'branch_mispredicts': 0,
+    'dcache_reads': 0,
+    'dcache_writes': 50000,
+    'core_cycles': 100000,
+    'icache_config': '32768,64,8,1,10,10,64,0',
+    'dcache_config': '32768,64,8,1,10,10,64,1',
+}
+
+def create_mcpat_xml(stats_data, config):
+    # config is the dict returned by parse_config
+    # Every hole in the template is filled from this dict
+    vals = dict(_CORE_DEFAULTS)
+    # Stats not found, reported together at the end
+    missing = set()
+
+    # Pull the config subtrees out once
+    board = config.get('board', {})
+    cache_hierarchy = board.get('cache_hierarchy', {})
+    l1i_list = cache_hierarchy.get('l1icaches', [])
+    l1d_list = cache_hierarchy.get('l1dcaches', [])
 
     # Get cache line size from the system configuration
-    cache_line_size = config.get('board', {}).get('cache_line_size', 64)
+    cache_line_size = board.get('cache_line_size', 64)
 
-    cores_list = config.get('board', {}).get('processor', {}).get('cores', [])
+    cores_list = board.get('processor', {}).get('cores', [])
     num_cores = len(cores_list) if isinstance(cores_list, list) else 1
 
     # System parameters
-    system_node = root.find(".//component[@name='system']")
-    if system_node:
-        system_node.find(".//param[@name='number_of_cores']").attrib['value'] = str(num_cores)
-        
-        # Get total cycles from sim_ticks
-        total_cycles = get_stat_value(stats_data, 'total_cycles', default=0)
-        system_node.find(".//stat[@name='total_cycles']").attrib['value'] = str(int(total_cycles))
-        system_node.find(".//stat[@name='busy_cycles']").attrib['value'] = str(int(total_cycles))
-        
-        # Get clock rate
-        clock_rate_hz = get_stat_value(stats_data, 'system.clk_domain.clock', 1000000000)
-        clock_rate_mhz = clock_rate_hz / 1000000.0
-        system_node.find(".//param[@name='target_core_clockrate']").attrib['value'] = str(clock_rate_mhz)
-
-    # Core parameters
-    for i in range(num_cores):
-        core_node_path = f".//component[@name='core{i}']"
-        core_node = root.find(core_node_path)
-        if core_node:
-            core_node.find(".//param[@name='clock_rate']").attrib['value'] = str(clock_rate_mhz)
-            
-            # Core stats
-            committed_insts = get_stat_value(stats_data, 'committedInsts')
-            committed_int = get_stat_value(stats_data, 'int_insts')
-            committed_fp = get_stat_value(stats_data, 'fp_insts')
-            branches = get_stat_value(stats_data, 'branches')
-            branch_mispredicts = get_stat_value(stats_data, 'branchMispredicts')
-            dcache_reads = get_stat_value(stats_data, f'system.l1dcaches{i}.ReadReq::total')
-            dcache_writes = get_stat_value(stats_data, f'system.l1dcaches{i}.WriteReq::total')
-            
-            core_node.find(".//stat[@name='total_instructions']").attrib['value'] = str(int(committed_insts))
-            core_node.find(".//stat[@name='int_instructions']").attrib['value'] = str(int(committed_int))
-            core_node.find(".//stat[@name='fp_instructions']").attrib['value'] = str(int(committed_fp))
-            core_node.find(".//stat[@name='branch_instructions']").attrib['value'] = str(int(branches))
-            core_node.find(".//stat[@name='branch_mispredictions']").attrib['value'] = str(int(branch_mispredicts))
-            core_node.find(".//stat[@name='load_instructions']").attrib['value'] = str(int(dcache_reads))
-            core_node.find(".//stat[@name='store_instructions']").attrib['value'] = str(int(dcache_writes))
-            core_node.find(".//stat[@name='committed_instructions']").attrib['value'] = str(int(committed_insts))
-            core_node.find(".//stat[@name='committed_int_instructions']").attrib['value'] = str(int(committed_int))
-            core_node.find(".//stat[@name='committed_fp_instructions']").attrib['value'] = str(int(committed_fp))
-            
-            core_node.find(".//stat[@name='total_cycles']").attrib['value'] = str(int(total_cycles))
-            core_node.find(".//stat[@name='busy_cycles']").attrib['value'] = str(int(total_cycles))
-
-            # L1I and L1D cache parameters
-            icache_config_node = core_node.find(f".//component[@name='icache']")
-            dcache_config_node = core_node.find(f".//component[@name='dcache']")
-
-            if icache_config_node:
-                try:
-                    l1i_config = config['board']['cache_hierarchy']['l1icaches'][i]
-                    size = int(l1i_config['size'].replace('B', '')) if isinstance(l1i_config['size'], str) else l1i_config['size']
-                    assoc = l1i_config['assoc']
-                    icache_config_node.find(".//param[@name='icache_config']").attrib['value'] = f"{size},{cache_line_size},{assoc},1,10,10,{cache_line_size},0"
-                except (KeyError, IndexError):
-                    print("Warning: Could not find L1I cache config. Using defaults.")
-
-            if dcache_config_node:
-                try:
-                    l1d_config = config['board']['cache_hierarchy']['l1dcaches'][i]
-                    size = int(l1d_config['size'].replace('B', '')) if isinstance(l1d_config['size'], str) else l1d_config['size']
-                    assoc = l1d_config['assoc']
-                    dcache_config_node.find(".//param[@name='dcache_config']").attrib['value'] = f"{size},{cache_line_size},{assoc},1,10,10,{cache_line_size},1"
-                except (KeyError, IndexError):
-                    print("Warning: Could not find L1D cache config. Using defaults.")
-
-    # L2 Cache
-    num_l2s = int(system_node.find(".//param[@name='number_of_L2s']").attrib['value'])
-    for i in range(num_l2s):
-        l2_node_path = f".//component[@name='L2{i}']"
-        l2_node = root.find(l2_node_path)
-        if l2_node:
-            l2_reads = get_stat_value(stats_data, f'system.l2cache.ReadReq::total')
-            l2_writes = get_stat_value(stats_data, f'system.l2cache.WriteReq::total')
-            l2_node.find(".//stat[@name='read_accesses']").attrib['value'] = str(int(l2_reads))
-            l2_node.find(".//stat[@name='write_accesses']").attrib['value'] = str(int(l2_writes))
-
-    return ET.tostring(root, encoding='unicode')
+    vals['number_of_cores'] = num_cores
+
+    # Get total cycles from sim_ticks
+    total_cycles = get_stat_value(stats_data, 'total_cycles', default=0, missing=missing)
+    vals['total_cycles'] = int(total_cycles)
+
+    # Get clock rate
+    clock_rate_hz = get_stat_value(stats_data, 'system.clk_domain.clock', 1000000000, missing=missing)
+    clock_rate_mhz = clock_rate_hz / 1000000.0
+    vals['target_core_clockrate'] = clock_rate_mhz
+
+    # Core parameters; the template models core0 only
+    if num_cores > 0:
+        vals['clock_rate'] = clock_rate_mhz
+
+        # Core stats
+        vals['committed_insts'] = int(get_stat_value(stats_data, 'committedInsts', missing=missing))
+        vals['committed_int'] = int(get_stat_value(stats_data, 'int_insts', missing=missing))
+        vals['committed_fp'] = int(get_stat_value(stats_data, 'fp_insts', missing=missing))
+        vals['branches'] = int(get_stat_value(stats_data, 'branches', missing=missing))
+        vals['branch_mispredicts'] = int(get_stat_value(stats_data, 'branchMispredicts', missing=missing))
+        vals['dcache_reads'] = int(get_stat_value(stats_data, 'system.l1dcaches0.ReadReq::total', missing=missing))
+        vals['dcache_writes'] = int(get_stat_value(stats_data, 'system.l1dcaches0.WriteReq::total', missing=missing))
+        vals['core_cycles'] = int(total_cycles)
+
+        # L1I and L1D cache parameters
+        try:
+            l1i_config = l1i_list[0]
+            size = int(l1i_config['size'].replace('B', '')) if isinstance(l1i_config['size'], str) else l1i_config['size']
+            assoc = l1i_config['assoc']
+            vals['icache_config'] = f"{size},{cache_line_size},{assoc},1,10,10,{cache_line_size},0"
+        except (KeyError, IndexError):
+            _log.warning("Could not find L1I cache config. Using defaults.")
+
+        try:
+            l1d_config = l1d_list[0]
+            size = int(l1d_config['size'].replace('B', '')) if isinstance(l1d_config['size'], str) else l1d_config['size']
+            assoc = l1d_config['assoc']
+            vals['dcache_config'] = f"{size},{cache_line_size},{assoc},1,10,10,{cache_line_size},1"
+        except (KeyError, IndexError):
+            _log.warning("Could not find L1D cache config. Using defaults.")
+
+    # L2 Cache; the template has a single shared L2 (L20)
+    vals['l2_reads'] = int(get_stat_value(stats_data, 'system.l2cache.ReadReq::total', missing=missing))
+    vals['l2_writes'] = int(get_stat_value(stats_data, 'system.l2cache.WriteReq::total', missing=missing))
+
+    if missing:
+        _log.warning("Stats not found, using default values: %s", ", ".join(sorted(missing)))
+
+    return MCPAT_TEMPLATE.format_map(vals).encode()
 
 if __name__ == "__main__":
     if len(sys.argv) != 3:
@@ -376,13 +426,15 @@ if __name__ == "__main__":
     stats_file = sys.argv[1]
     config_file = sys.argv[2]
 
+    logging.basicConfig(format="Warning: %(message)s")
+
     try:
         stats_data = parse_stats(stats_file)
         config_data = parse_config(config_file)
         
         xml_output = create_mcpat_xml(stats_data, config_data)
         
-        with open("mcpat_output.xml", "w") as f:
+        with open("mcpat_output.xml", "wb") as f:
             f.write(xml_output)
             
         print("mcpat_output.xml created successfully.")